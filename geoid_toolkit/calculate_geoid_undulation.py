@@ -50,6 +50,7 @@ PROGRAM DEPENDENCIES:
     gauss_weights.py: Computes Gaussian weights as a function of degree
 
 UPDATE HISTORY:
+    Updated 08/2026: use builtin float and int in place of removed numpy aliases
     Updated 11/2020: added function docstrings
     Updated 07/2019: split read and wrapper funciton into separate files
     Written 07/2017
@@ -83,9 +84,9 @@ def calculate_geoid_undulation(lon, lat, gravity_model_file, REFERENCE='WGS84',
     """
     #-- read gravity model Ylms and change tide if specified
     Ylms = read_ICGEM_harmonics(gravity_model_file,LMAX=LMAX,TIDE=TIDE)
-    R = np.float(Ylms['radius'])
-    GM = np.float(Ylms['earth_gravity_constant'])
-    LMAX = np.int(Ylms['max_degree']) if not LMAX else LMAX
+    R = float(Ylms['radius'])
+    GM = float(Ylms['earth_gravity_constant'])
+    LMAX = int(Ylms['max_degree']) if not LMAX else LMAX
     #-- calculate geoid at coordinates
     N = geoid_undulation(lat, lon, REFERENCE, Ylms['clm'], Ylms['slm'], LMAX,
         R, GM, GAUSS=GAUSS, EPS=1e-8)
@@ -23,16 +23,27 @@ OPTIONS:
     ASTYPE: output variable type (e.g. np.float128).  Default is np.float64
 
 NOTES:
-    ptemp is a dummy array of length (0:lmax) storing unnormalized pl values
+    the unnormalized recurrence only ever reads degrees l-1 and l-2, so
+    two rolling buffers of length nx are kept in place of a full matrix
 
 PYTHON DEPENDENCIES:
     numpy: Scientific Computing Tools For Python (https://numpy.org)
+    numba: NumPy aware dynamic Python compiler using LLVM
+        (https://numba.pydata.org) (optional)
 
 REFERENCE:
     Hofmann-Wellenhof and Moritz, "Physical Geodesy" (2005)
         http://www.springerlink.com/content/978-3-211-33544-4
 
 UPDATE HISTORY:
+    Updated 08/2026: generate unrolled kernels specialized to small lmax
+    Updated 08/2026: use builtin float and int in place of removed numpy aliases
+    Updated 08/2026: advance compiled recurrence two degrees per iteration
+        with independent even and odd parity chains
+    Updated 08/2026: process coordinate blocks in the compiled kernel
+        so the recurrence vectorizes with terms held in SIMD registers
+    Updated 08/2026: use parallel compiled kernel if numba is available
+    Updated 08/2026: replace ptemp matrix with two rolling recurrence buffers
     Updated 09/2020: verify dimensions of x variable
     Updated 08/2020: prevent zero divisions by changing u==0 to eps of data type
     Updated 07/2020: added function docstrings
@@ -40,9 +51,16 @@ UPDATE HISTORY:
         added option ASTYPE to output as different variable types e.g. np.float
     Written 03/2013
 """
+import math
+import functools
 import numpy as np
+#-- attempt imports: numba is an optional dependency
+try:
+    import numba
+except (ImportError, ModuleNotFoundError):
+    numba = None
 
-def legendre_polynomials(lmax,x,ASTYPE=np.float):
+def legendre_polynomials(lmax,x,ASTYPE=np.float64):
     """
     Computes fully-normalized Legendre polynomials and their first derivative
 
@@ -65,35 +83,240 @@ def legendre_polynomials(lmax,x,ASTYPE=np.float):
     #-- size of the x array
     nx = len(x)
     #-- verify data type of spherical harmonic truncation
-    lmax = np.int(lmax)
+    lmax = int(lmax)
     #-- output matrix of normalized legendre polynomials
     pl = np.zeros((lmax+1,nx),dtype=ASTYPE)
     #-- output matrix of First derivative of Legendre polynomials
     dpl = np.zeros((lmax+1,nx),dtype=ASTYPE)
-    #-- dummy matrix for the recurrence relation
-    ptemp = np.zeros((lmax+1,nx),dtype=ASTYPE)
 
     #-- u is sine of colatitude (cosine of latitude) so that 0 <= s <= 1
     #-- for x=cos(th): u=sin(th)
     u = np.sqrt(1.0 - x**2)
     #-- update where u==0 to eps of data type to prevent invalid divisions
     u[u == 0] = np.finfo(u.dtype).eps
+    #-- inverse of u computed once for the derivative relation
+    inv_sin = 1.0/u
 
+    #-- precompute the recurrence coefficients for each degree l
+    #-- (lmax of each is scalar work hoisted out of the loops below)
+    ll = np.arange(lmax+1,dtype=ASTYPE)
+    lnz = np.maximum(ll,1.0)
+    a = ((2.0*ll)-1.0)/lnz
+    b = (ll-1.0)/lnz
+    norm = np.sqrt((2.0*ll)+1.0)
+    fl = np.sqrt((ll**2.0)*((2.0*ll)+1.0)/np.maximum((2.0*ll)-1.0,1.0))
+
+    #-- use the compiled kernels if numba is available
+    #-- (the kernels are specialized for double precision calculations)
+    if numba is not None and (pl.dtype == np.float64):
+        #-- for small fixed degrees: generate and compile a kernel
+        #-- specialized to this lmax with the recurrence fully unrolled
+        #-- and the coefficients baked in as compile-time constants
+        #-- (compiled kernels are cached and reused across calls)
+        if (lmax <= _SPECIALIZE_LMAX):
+            _specialized_kernel(lmax)(x, inv_sin, pl, dpl)
+            return (pl, dpl)
+        #-- two-step recurrence coefficients (Tygert, 2010) advancing
+        #-- each parity chain from degrees l-2 and l-4 per iteration:
+        #-- P[l] = (x^2 + alpha[l])*beta[l]*P[l-2] + gamma[l]*P[l-4]
+        den = np.maximum(ll*(ll-1.0)*((2.0*ll)-5.0),1.0)
+        beta = ((2.0*ll)-1.0)*((2.0*ll)-3.0)/np.maximum(ll*(ll-1.0),1.0)
+        gamma = -((2.0*ll)-1.0)*(ll-2.0)*(ll-3.0)/den
+        alpha = -(((2.0*ll)-1.0)*(ll-2.0)**2.0/den + (ll-1.0)/lnz)/beta
+        _legendre_kernel(x, inv_sin, pl, dpl, alpha, beta, gamma, norm, fl)
+        return (pl, dpl)
+
+    #-- rolling buffers with the unnormalized polynomials for degrees
+    #-- l-2 and l-1 (only terms read by the recurrence relation)
+    p0 = np.ones((nx),dtype=ASTYPE)
+    p1 = np.copy(x)
+    #-- scratch buffer for the recurrence relation
+    tmp = np.empty((nx),dtype=ASTYPE)
     #-- Initialize the recurrence relation
-    ptemp[0,:] = 1.0
-    ptemp[1,:] = x
     #-- Normalization is geodesy convention
-    pl[0,:] = ptemp[0,:]
-    pl[1,:] = np.sqrt(3.0)*ptemp[1,:]
+    pl[0,:] = p0
+    pl[1,:] = np.sqrt(3.0)*p1
     for l in range(2,lmax+1):
-        ptemp[l,:] = (((2.0*l)-1.0)/l)*x*ptemp[l-1,:] - ((l-1.0)/l)*ptemp[l-2,:]
+        #-- unnormalized polynomial of degree l computed in-place
+        #-- (the unwritten output row doubles as a second scratch buffer)
+        np.multiply(x, p1, out=tmp)
+        tmp *= a[l]
+        np.multiply(p0, b[l], out=pl[l,:])
+        tmp -= pl[l,:]
         #-- Normalization is geodesy convention
-        pl[l,:] = np.sqrt((2.0*l)+1.0)*ptemp[l,:]
+        np.multiply(tmp, norm[l], out=pl[l,:])
+        #-- rotate the rolling buffers for the next degree
+        p0, p1, tmp = p1, tmp, p0
 
     #-- First derivative of Legendre polynomials
-    for l in range(1,lmax+1):
-        fl = np.sqrt(((l**2.0) * (2.0*l + 1.0)) / (2.0*l - 1.0))
-        dpl[l,:] = (1.0/u)*(l*x*pl[l,:] - fl*pl[l-1,:])
+    #-- broadcast over degree and coordinate in a single pass staged
+    #-- in-place in the output matrix to limit transient allocations
+    #-- (dpl[0,:] is identically zero from the allocation above)
+    l_col = ll[1:,None]
+    fl_col = fl[1:,None]
+    np.multiply(x[None,:], pl[1:,:], out=dpl[1:,:])
+    dpl[1:,:] *= l_col
+    dpl[1:,:] -= fl_col*pl[:-1,:]
+    dpl[1:,:] *= inv_sin[None,:]
 
     #-- return the legendre polynomials and their first derivative
     return (pl, dpl)
+
+#-- number of coordinates per block in the compiled kernel
+#-- (one AVX-512 vector of doubles: lets LLVM keep the rolling
+#-- recurrence terms of a full block in SIMD registers)
+_BLOCK = 8
+#-- largest degree for which an lmax-specialized kernel is generated
+#-- (bounds the size of the unrolled source and its compile time)
+_SPECIALIZE_LMAX = 128
+
+#-- PURPOSE: generate and compile a kernel specialized to a fixed lmax
+#-- the recurrence is fully unrolled with the per-degree coefficients
+#-- baked in as compile-time constants, enabling constant folding and
+#-- register scheduling for the fixed trip count
+if numba is not None:
+    @functools.lru_cache(maxsize=8)
+    def _specialized_kernel(lmax):
+        lines = []
+        lines.append('def _kernel(x, inv_sin, pl, dpl):')
+        lines.append('    for j in numba.prange(x.shape[0]):')
+        lines.append('        xj = x[j]')
+        lines.append('        sj = inv_sin[j]')
+        lines.append('        p0 = 1.0')
+        lines.append('        p1 = xj')
+        lines.append('        pl[0,j] = 1.0')
+        lines.append('        dpl[0,j] = 0.0')
+        if (lmax >= 1):
+            #-- Normalization is geodesy convention
+            lines.append('        pl[1,j] = {0!r}*xj'.format(math.sqrt(3.0)))
+        for l in range(2,lmax+1):
+            a = ((2.0*l)-1.0)/l
+            b = (l-1.0)/l
+            norm = math.sqrt((2.0*l)+1.0)
+            lines.append('        p2 = {0!r}*xj*p1 - {1!r}*p0'.format(a,b))
+            #-- Normalization is geodesy convention
+            lines.append('        pl[{0},j] = {1!r}*p2'.format(l,norm))
+            lines.append('        p0 = p1')
+            lines.append('        p1 = p2')
+        #-- First derivative of Legendre polynomials
+        for l in range(1,lmax+1):
+            fl = math.sqrt(((l**2.0)*((2.0*l)+1.0))/((2.0*l)-1.0))
+            lines.append(('        dpl[{0},j] = sj*({1!r}*xj*pl[{0},j]'
+                ' - {2!r}*pl[{3},j])').format(l,float(l),fl,l-1))
+        #-- compile the generated source with numba
+        namespace = {'numba': numba}
+        exec('\n'.join(lines), namespace)
+        return numba.njit(parallel=True, fastmath=True)(namespace['_kernel'])
+
+#-- PURPOSE: compiled kernel for the recurrence and derivative relations
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _legendre_kernel(x, inv_sin, pl, dpl, alpha, beta, gamma, norm, fl):
+        lmax = pl.shape[0] - 1
+        nx = x.shape[0]
+        sqrt3 = np.sqrt(3.0)
+        nb = nx//_BLOCK
+        #-- parallelize over blocks of coordinates: within each block the
+        #-- innermost loops run over contiguous lanes so the recurrence
+        #-- vectorizes with the rolling terms resident in registers
+        for ib in numba.prange(nb):
+            j0 = ib*_BLOCK
+            vx2 = np.empty((_BLOCK),dtype=np.float64)
+            ve0 = np.empty((_BLOCK),dtype=np.float64)
+            ve1 = np.empty((_BLOCK),dtype=np.float64)
+            vo0 = np.empty((_BLOCK),dtype=np.float64)
+            vo1 = np.empty((_BLOCK),dtype=np.float64)
+            #-- seed the even and odd parity chains with degrees 0 to 3
+            for k in range(_BLOCK):
+                xj = x[j0+k]
+                vx2[k] = xj*xj
+                ve0[k] = 1.0
+                vo0[k] = xj
+                ve1[k] = 1.5*vx2[k] - 0.5
+                vo1[k] = xj*(2.5*vx2[k] - 1.5)
+                pl[0,j0+k] = 1.0
+                dpl[0,j0+k] = 0.0
+                #-- Normalization is geodesy convention
+                if (lmax >= 1):
+                    pl[1,j0+k] = sqrt3*xj
+                if (lmax >= 2):
+                    pl[2,j0+k] = norm[2]*ve1[k]
+                if (lmax >= 3):
+                    pl[3,j0+k] = norm[3]*vo1[k]
+            #-- advance both chains two degrees per iteration: the even
+            #-- and odd recurrences are independent and stay in flight
+            #-- together on separate dependency chains
+            l = 4
+            while (l+1) <= lmax:
+                ae = alpha[l]
+                be = beta[l]
+                ge = gamma[l]
+                ne = norm[l]
+                ao = alpha[l+1]
+                bo = beta[l+1]
+                go = gamma[l+1]
+                no = norm[l+1]
+                for k in range(_BLOCK):
+                    pe = (vx2[k] + ae)*be*ve1[k] + ge*ve0[k]
+                    po = (vx2[k] + ao)*bo*vo1[k] + go*vo0[k]
+                    #-- Normalization is geodesy convention
+                    pl[l,j0+k] = ne*pe
+                    pl[l+1,j0+k] = no*po
+                    ve0[k] = ve1[k]
+                    ve1[k] = pe
+                    vo0[k] = vo1[k]
+                    vo1[k] = po
+                l += 2
+            #-- final even degree when lmax is even
+            if (l <= lmax):
+                ae = alpha[l]
+                be = beta[l]
+                ge = gamma[l]
+                ne = norm[l]
+                for k in range(_BLOCK):
+                    pe = (vx2[k] + ae)*be*ve1[k] + ge*ve0[k]
+                    #-- Normalization is geodesy convention
+                    pl[l,j0+k] = ne*pe
+            #-- First derivative of Legendre polynomials
+            for l in range(1,lmax+1):
+                fll = fl[l]
+                for k in range(_BLOCK):
+                    j = j0 + k
+                    dpl[l,j] = inv_sin[j]*(l*x[j]*pl[l,j] - fll*pl[l-1,j])
+        #-- remaining coordinates beyond the last full block
+        for j in range(nb*_BLOCK,nx):
+            xj = x[j]
+            x2 = xj*xj
+            e0 = 1.0
+            o0 = xj
+            e1 = 1.5*x2 - 0.5
+            o1 = xj*(2.5*x2 - 1.5)
+            pl[0,j] = 1.0
+            dpl[0,j] = 0.0
+            #-- Normalization is geodesy convention
+            if (lmax >= 1):
+                pl[1,j] = sqrt3*xj
+            if (lmax >= 2):
+                pl[2,j] = norm[2]*e1
+            if (lmax >= 3):
+                pl[3,j] = norm[3]*o1
+            l = 4
+            while (l+1) <= lmax:
+                pe = (x2 + alpha[l])*beta[l]*e1 + gamma[l]*e0
+                po = (x2 + alpha[l+1])*beta[l+1]*o1 + gamma[l+1]*o0
+                #-- Normalization is geodesy convention
+                pl[l,j] = norm[l]*pe
+                pl[l+1,j] = norm[l+1]*po
+                e0 = e1
+                e1 = pe
+                o0 = o1
+                o1 = po
+                l += 2
+            #-- final even degree when lmax is even
+            if (l <= lmax):
+                pe = (x2 + alpha[l])*beta[l]*e1 + gamma[l]*e0
+                #-- Normalization is geodesy convention
+                pl[l,j] = norm[l]*pe
+            #-- First derivative of Legendre polynomials
+            for l in range(1,lmax+1):
+                dpl[l,j] = inv_sin[j]*(l*xj*pl[l,j] - fl[l]*pl[l-1,j])
@@ -31,6 +31,16 @@ OPTIONS:
         mean_tide: restores permanent tidal potentials (direct and indirect)
         zero_tide: restores permanent direct tidal potential
     FLAG: string denoting data lines
+    ICGEM_CACHE: read and write a parsed numpy sidecar file (.npz)
+        to skip the text parse on repeat loads
+    PACKED: store coefficients as packed 1-D triangular arrays indexed
+        by l*(l+1)//2 + m, halving the memory of the dense matrices
+        (expand with the unpack helper function)
+    DTYPE: storage type for the coefficient arrays (default np.float64)
+        reduced precision (e.g. np.float32) halves the memory footprint
+        where truncation error is negligible next to the model errors
+    RETURN_NAMEDTUPLE: return an ICGEMModel namedtuple with attribute
+        access instead of a python dictionary
 
 OUTPUTS:
     clm: cosine spherical harmonics of input data
@@ -49,11 +59,27 @@ PYTHON DEPENDENCIES:
     numpy: Scientific Computing Tools For Python
         https://numpy.org
         https://numpy.org/doc/stable/user/numpy-for-matlab-users.html
+    numba: NumPy aware dynamic Python compiler using LLVM
+        (https://numba.pydata.org) (optional)
 
 PROGRAM DEPENDENCIES:
     calculate_tidal_offset.py: calculates the C20 offset for a tidal system
 
 UPDATE HISTORY:
+    Updated 08/2026: add option to return an ICGEMModel namedtuple
+    Updated 08/2026: scatter coefficients in a compiled numba kernel
+    Updated 08/2026: read gravity model files through a memory map
+    Updated 08/2026: classify data lines with a startswith fast path
+    Updated 08/2026: build fortran exponent translation table at import
+    Updated 08/2026: use builtin float and int in place of removed numpy aliases
+    Updated 08/2026: consolidate Julian date calculation into a helper
+        function using integer arithmetic
+    Updated 08/2026: add option to set the coefficient storage type
+    Updated 08/2026: add option to store packed 1-D triangular arrays
+    Updated 08/2026: add option to cache parsed models to sidecar files
+    Updated 08/2026: bulk parse data lines with the numpy tokenizer
+    Updated 08/2026: parse gravity model files in a single streaming pass
+    Updated 08/2026: compile regular expression operators at module import
     Updated 05/2021: Add GRAZ/SWARM/COST-G ICGEM file
     Updated 03/2021: made degree of truncation LMAX a keyword argument
     Updated 07/2020: added function docstrings
@@ -62,12 +88,57 @@ UPDATE HISTORY:
     Written 12/2015
 """
 import os
+import io
 import re
+import mmap
+import collections
+import zipfile
 import numpy as np
 from geoid_toolkit.calculate_tidal_offset import calculate_tidal_offset
+#-- attempt imports: numba is an optional dependency
+try:
+    import numba
+except (ImportError, ModuleNotFoundError):
+    numba = None
+
+#-- compile regular expression operators once at module import
+#-- GRAZ: Institute of Geodesy from GRAZ University of Technology
+_regex_GRAZ = re.compile((r'(.*?)-({0})_(.*?)_(\d+)-(\d+)'
+    r'(\.gz|\.gfc|\.txt)').format(r'Grace_operational|Grace2018'), re.VERBOSE)
+#-- SWARM: data from SWARM satellite
+_regex_SWARM = re.compile((r'({0})_(.*?)_(EGF_SHA_2)__(.*?)_(.*?)_(.*?)'
+    r'(\.gz|\.gfc|\.txt)').format(r'SW'), re.VERBOSE)
+#-- COST-G: Combine product of the IGFS
+_regex_COSTG = re.compile((r'(.*?)-2_(\d+)-(\d+)_(.*?)_({0})_(.*?)_(\d+)(.*?)'
+    r'(\.gz|\.gfc|\.txt)?$').format('COSTG'), re.VERBOSE)
+#-- parameters to extract from the gravity model file header
+_header_parameters = ['modelname','earth_gravity_constant','radius',
+    'max_degree','errors','norm','tide_system']
+_regex_header = re.compile('(' + '|'.join(_header_parameters) + ')')
+
+#-- lightweight container for a parsed gravity model: C-level attribute
+#-- access avoids the per-field dict hashing in downstream loops
+#-- every field but the coefficients defaults to None: header keywords
+#-- such as norm and tide_system are optional in the ICGEM format
+ICGEMModel = collections.namedtuple('ICGEMModel', ['clm','slm',
+    'modelname','earth_gravity_constant','radius','max_degree','errors',
+    'norm','tide_system','eclm','eslm','time','start','end'],
+    defaults=(None,)*12)
+#-- translation table converting fortran d exponents to e
+_DEXP = bytes.maketrans(b'dD', b'ee')
+
+#-- PURPOSE: Julian date of a calendar year and day of the year
+#-- equivalent to the floor-based formula but using integer arithmetic
+#-- without any per-call ufunc dispatch on 0-dimensional scalars
+def _julian(year, day):
+    year = int(year)
+    return 367*year - (7*year)//4 - (3*((7*year - 8)//700 + 1))//4 + \
+        275//9 + day + 1721028.5
 
 #-- PURPOSE: read spherical harmonic coefficients of a gravity model
-def read_ICGEM_harmonics(model_file, LMAX=None, TIDE='tide_free', FLAG='gfc'):
+def read_ICGEM_harmonics(model_file, LMAX=None, TIDE='tide_free', FLAG='gfc',
+    ICGEM_CACHE=False, PACKED=False, DTYPE=np.float64,
+    RETURN_NAMEDTUPLE=False):
     """
     Extract gravity model spherical harmonics from GFZ/GRAZ/SWARM/COST-G ICGEM gfc files
     In case of GRAZ/SWARM/COST-G, save also the date of the series
@@ -81,6 +152,13 @@ def read_ICGEM_harmonics(model_file, LMAX=None, TIDE='tide_free', FLAG='gfc'):
     -----------------
     TIDE: tide system of output geoid
     FLAG: string denoting data lines
+    ICGEM_CACHE: read and write a parsed numpy sidecar file
+        to skip the text parse on repeat loads
+    PACKED: store coefficients as packed 1-D triangular arrays
+        indexed by l*(l+1)//2 + m (see unpack)
+    DTYPE: storage type for the coefficient arrays
+    RETURN_NAMEDTUPLE: return an ICGEMModel namedtuple instead of a
+        python dictionary
 
     Returns
     -------
@@ -104,42 +182,39 @@ def read_ICGEM_harmonics(model_file, LMAX=None, TIDE='tide_free', FLAG='gfc'):
     # -- python dictionary with model input and headers
     model_input = {}
 
+    #-- check for a valid numpy sidecar file from a previous parse
+    cache_file = '{0}.npz'.format(os.path.expanduser(model_file))
+    if ICGEM_CACHE and os.access(cache_file, os.F_OK) and \
+        (os.path.getmtime(cache_file) >=
+            os.path.getmtime(os.path.expanduser(model_file))):
+        cached = _load_cache(cache_file, LMAX, TIDE, FLAG, PACKED, DTYPE)
+        if cached is not None:
+            return ICGEMModel(**cached) if RETURN_NAMEDTUPLE else cached
+
     if 'ITSG' in model_file:
-        # -- compile numerical expression operator for parameters from files
         # -- GRAZ: Institute of Geodesy from GRAZ University of Technology
-        regex_pattern = (r'(.*?)-({0})_(.*?)_(\d+)-(\d+)'
-                         r'(\.gz|\.gfc|\.txt)').format(r'Grace_operational|Grace2018')
-        rx = re.compile(regex_pattern, re.VERBOSE)
         # -- extract parameters from input filename
-        PFX, SAT, trunc, year, month, SFX = rx.findall(os.path.basename(model_file)).pop()
+        PFX, SAT, trunc, year, month, SFX = _regex_GRAZ.findall(os.path.basename(model_file)).pop()
 
         # -- convert string to integer
         year, month = int(year), int(month)
 
     elif 'SW_' in model_file:
-        # -- compile numerical expression operator for parameters from files
         # -- SWARM: data from SWARM satellite
-        regex_pattern = (r'({0})_(.*?)_(EGF_SHA_2)__(.*?)_(.*?)_(.*?)'
-                         r'(\.gz|\.gfc|\.txt)').format(r'SW')
-        rx = re.compile(regex_pattern, re.VERBOSE)
-        SAT, tmp, PROD, start_date, end_date, RL, SFX = rx.findall(os.path.basename(model_file)).pop()
+        SAT, tmp, PROD, start_date, end_date, RL, SFX = _regex_SWARM.findall(os.path.basename(model_file)).pop()
 
         # -- convert string to integer
         year = int(start_date[:4])
         month = int(start_date[4:6])
 
     elif 'COSTG' in model_file:
-        # -- compile numerical expression operator for parameters from files
         # -- COST-G: Combine product of the IGFS
-        regex_pattern = (r'(.*?)-2_(\d+)-(\d+)_(.*?)_({0})_(.*?)_(\d+)(.*?)'
-                         r'(\.gz|\.gfc|\.txt)?$').format('COSTG')
-        rx = re.compile(regex_pattern, re.VERBOSE)
-        PFX, SD, ED, N, PRC, F1, DRL, F2, SFX = rx.findall(os.path.basename(model_file)).pop()
+        PFX, SD, ED, N, PRC, F1, DRL, F2, SFX = _regex_COSTG.findall(os.path.basename(model_file)).pop()
 
-        start_yr = np.float(SD[:4])
-        end_yr = np.float(ED[:4])
-        start_day = np.float(SD[4:])
-        end_day = np.float(ED[4:])
+        start_yr = float(SD[:4])
+        end_yr = float(ED[:4])
+        start_day = float(SD[4:])
+        end_day = float(ED[4:])
 
     if 'ITSG' in model_file or 'SW_' in model_file:
         # -- calculate mid-month date taking into account if measurements are
@@ -155,16 +230,12 @@ def read_ICGEM_harmonics(model_file, LMAX=None, TIDE='tide_free', FLAG='gfc'):
         end_day = np.sum(dpm[:month])
 
         # -- Calculation of Mid-month value
-        mid_day = np.mean([start_day, end_day])
+        mid_day = (start_day + end_day)*0.5
         # -- Calculating the mid-month date in decimal form
         model_input['time'] = year + mid_day / dpy
         # -- Calculating the Julian dates of the start and end date
-        model_input['start'] = np.float(367.0 * year - np.floor(7.0 * year / 4.0) -
-                                        np.floor(3.0 * (np.floor((year - 8.0 / 7.0) / 100.0) + 1.0) / 4.0) +
-                                        np.floor(275.0 / 9.0) + start_day + 1721028.5)
-        model_input['end'] = np.float(367.0 * year - np.floor(7.0 * year / 4.0) -
-                                      np.floor(3.0 * (np.floor((year - 8.0 / 7.0) / 100.0) + 1.0) / 4.0) +
-                                      np.floor(275.0 / 9.0) + end_day + 1721028.5)
+        model_input['start'] = _julian(year, start_day)
+        model_input['end'] = _julian(year, end_day)
 
     elif 'COSTG' in model_file:
         # -- calculate mid-month date taking into account if measurements are
@@ -177,59 +248,179 @@ def read_ICGEM_harmonics(model_file, LMAX=None, TIDE='tide_free', FLAG='gfc'):
         # -- For data that crosses years (end_yr - start_yr should be at most 1)
         end_cyclic = ((end_yr - start_yr) * dpy + end_day)
         # -- Calculate mid-month value
-        mid_day = np.mean([start_day, end_cyclic])
+        mid_day = (start_day + end_cyclic)*0.5
 
         # -- Calculating the mid-month date in decimal form
         model_input['time'] = start_yr + mid_day / dpy
         # -- Calculating the Julian dates of the start and end date
-        model_input['start'] = np.float(367.0 * start_yr - np.floor(7.0 * start_yr / 4.0) -
-                                        np.floor(3.0 * (np.floor((start_yr - 8.0 / 7.0) / 100.0) + 1.0) / 4.0) +
-                                        np.floor(275.0 / 9.0) + start_day + 1721028.5)
-        model_input['end'] = np.float(367.0 * end_yr - np.floor(7.0 * end_yr / 4.0) -
-                                      np.floor(3.0 * (np.floor((end_yr - 8.0 / 7.0) / 100.0) + 1.0) / 4.0) +
-                                      np.floor(275.0 / 9.0) + end_day + 1721028.5)
-
-    #-- read input data
-    with open(os.path.expanduser(model_file),'r') as f:
-        file_contents = f.read().splitlines()
-    #-- extract parameters from header
-    header_parameters = ['modelname','earth_gravity_constant','radius',
-        'max_degree','errors','norm','tide_system']
-    parameters_regex = '(' + '|'.join(header_parameters) + ')'
-    header = [l for l in file_contents if re.match(parameters_regex,l)]
-    for line in header:
-        #-- split the line into individual components
-        line_contents = line.split()
-        model_input[line_contents[0]] = line_contents[1]
+        model_input['start'] = _julian(start_yr, start_day)
+        model_input['end'] = _julian(end_yr, end_day)
+
+    #-- predicate classifying data lines by the data marker flag
+    #-- literal flags (e.g. 'gfc') use the C-level str.startswith fast
+    #-- path and only general patterns fall back to the regex engine
+    if isinstance(FLAG, str) and FLAG.isalnum():
+        is_data = lambda line: line.startswith(FLAG)
+    else:
+        is_data = re.compile(FLAG).match
+    #-- SWARM files don't contain errors
+    errors = not ('SW_' in model_file)
+    #-- read the input file in a single streaming pass collecting the
+    #-- data lines for bulk parsing below
+    #-- the file is memory-mapped so lines are read zero-copy from the
+    #-- operating system page cache and decoded lazily
+    gfc_lines = []
+    with open(os.path.expanduser(model_file),'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b''):
+                line = raw.decode('utf-8')
+                if is_data(line):
+                    gfc_lines.append(line)
+                elif _regex_header.match(line):
+                    #-- split the header line into individual components
+                    line_contents = line.split()
+                    model_input[line_contents[0]] = line_contents[1]
     #-- set degree of truncation from model if not presently set
-    LMAX = np.int(model_input['max_degree']) if not LMAX else LMAX
+    LMAX = int(model_input['max_degree']) if not LMAX else LMAX
     #-- allocate for each Coefficient
-    model_input['clm'] = np.zeros((LMAX+1,LMAX+1))
-    model_input['slm'] = np.zeros((LMAX+1,LMAX+1))
-    if not('SW_' in model_file): #-- SWARM doesn't contain errors
-        model_input['eclm'] = np.zeros((LMAX+1,LMAX+1))
-        model_input['eslm'] = np.zeros((LMAX+1,LMAX+1))
-    #-- reduce file_contents to input data using data marker flag
-    input_data = [l for l in file_contents if re.match(FLAG,l)]
-    #-- for each line of data in the gravity file
-    for line in input_data:
-        #-- split the line into individual components replacing fortran d
-        line_contents = re.sub('d','e',line,flags=re.IGNORECASE).split()
-        #-- degree and order for the line
-        l1 = np.int(line_contents[1])
-        m1 = np.int(line_contents[2])
-        #-- if degree and order are below the truncation limits
-        if ((l1 <= LMAX) and (m1 <= LMAX)):
-            model_input['clm'][l1,m1] = np.float(line_contents[3])
-            model_input['slm'][l1,m1] = np.float(line_contents[4])
-            if not ('SW_' in model_file):  # -- SWARM doesn't contain errors
-                model_input['eclm'][l1,m1] = np.float(line_contents[5])
-                model_input['eslm'][l1,m1] = np.float(line_contents[6])
+    #-- either as packed 1-D triangular arrays or dense matrices
+    dims = ((LMAX+1)*(LMAX+2)//2,) if PACKED else (LMAX+1,LMAX+1)
+    model_input['clm'] = np.zeros(dims, dtype=DTYPE)
+    model_input['slm'] = np.zeros(dims, dtype=DTYPE)
+    if errors:
+        model_input['eclm'] = np.zeros(dims, dtype=DTYPE)
+        model_input['eslm'] = np.zeros(dims, dtype=DTYPE)
+    #-- parse all data lines at once with the C-level tokenizer,
+    #-- replacing fortran d exponents with a bulk byte translation
+    if gfc_lines:
+        buf = ''.join(gfc_lines).encode().translate(_DEXP)
+        usecols = (1,2,3,4,5,6) if errors else (1,2,3,4)
+        arr = np.loadtxt(io.BytesIO(buf), usecols=usecols, ndmin=2)
+        #-- scatter the coefficients into the truncated arrays
+        if numba is not None:
+            #-- compiled kernel: no intermediate index or mask arrays
+            clm = model_input['clm']
+            slm = model_input['slm']
+            eclm = model_input['eclm'] if errors else clm[:0]
+            eslm = model_input['eslm'] if errors else clm[:0]
+            scatter = _scatter_packed if PACKED else _scatter_dense
+            scatter(arr, clm, slm, eclm, eslm, LMAX, errors)
+        else:
+            #-- degree and order of each line
+            l1 = arr[:,0].astype(np.int64)
+            m1 = arr[:,1].astype(np.int64)
+            #-- reduce to degrees and orders below the truncation limits
+            mask = (l1 <= LMAX) & (m1 <= LMAX)
+            #-- indices within the packed or dense coefficient arrays
+            if PACKED:
+                indices = (l1[mask]*(l1[mask]+1)//2 + m1[mask],)
+            else:
+                indices = (l1[mask],m1[mask])
+            #-- scatter coefficients with vectorized advanced indexing
+            model_input['clm'][indices] = arr[mask,2]
+            model_input['slm'][indices] = arr[mask,3]
+            if errors:
+                model_input['eclm'][indices] = arr[mask,4]
+                model_input['eslm'][indices] = arr[mask,5]
     #-- calculate the tidal offset if changing the tide system
     if TIDE in ('mean_tide','zero_tide'):
         model_input['tide_system'] = TIDE
-        GM = np.float(model_input['earth_gravity_constant'])
-        R = np.float(model_input['radius'])
-        model_input['clm'][2,0] += calculate_tidal_offset(TIDE,GM,R,'WGS84')
+        GM = float(model_input['earth_gravity_constant'])
+        R = float(model_input['radius'])
+        #-- index of C20 within the packed or dense coefficient arrays
+        iC20 = (3,) if PACKED else (2,0)
+        model_input['clm'][iC20] += calculate_tidal_offset(TIDE,GM,R,'WGS84')
+    #-- write the parsed model to the sidecar file for repeat loads
+    if ICGEM_CACHE:
+        _save_cache(cache_file, model_input, LMAX, TIDE, FLAG, PACKED, DTYPE)
     #-- return the spherical harmonics and parameters
+    if RETURN_NAMEDTUPLE:
+        return ICGEMModel(**model_input)
     return model_input
+
+#-- PURPOSE: expand packed 1-D triangular coefficients to a dense matrix
+def unpack(v, LMAX):
+    """
+    Expand a packed 1-D triangular coefficient array into a dense
+    (degree, order) matrix
+
+    Arguments
+    ---------
+    v: packed coefficient array indexed by l*(l+1)//2 + m
+    LMAX: maximum degree and order of the coefficient array
+    """
+    matrix = np.zeros((LMAX+1,LMAX+1), dtype=v.dtype)
+    l1, m1 = np.tril_indices(LMAX+1)
+    matrix[l1,m1] = v[l1*(l1+1)//2 + m1]
+    return matrix
+
+#-- PURPOSE: compiled kernels scattering the bulk-parsed coefficient
+#-- block into the dense or packed arrays without intermediate arrays
+if numba is not None:
+    @numba.njit(cache=True)
+    def _scatter_dense(arr, clm, slm, eclm, eslm, LMAX, errors):
+        for k in range(arr.shape[0]):
+            l1 = int(arr[k,0])
+            m1 = int(arr[k,1])
+            #-- if degree and order are below the truncation limits
+            if (l1 <= LMAX) and (m1 <= LMAX):
+                clm[l1,m1] = arr[k,2]
+                slm[l1,m1] = arr[k,3]
+                if errors:
+                    eclm[l1,m1] = arr[k,4]
+                    eslm[l1,m1] = arr[k,5]
+
+    @numba.njit(cache=True)
+    def _scatter_packed(arr, clm, slm, eclm, eslm, LMAX, errors):
+        for k in range(arr.shape[0]):
+            l1 = int(arr[k,0])
+            m1 = int(arr[k,1])
+            #-- if degree and order are below the truncation limits
+            if (l1 <= LMAX) and (m1 <= LMAX):
+                i = l1*(l1+1)//2 + m1
+                clm[i] = arr[k,2]
+                slm[i] = arr[k,3]
+                if errors:
+                    eclm[i] = arr[k,4]
+                    eslm[i] = arr[k,5]
+
+#-- PURPOSE: write a parsed gravity model to a numpy sidecar file
+def _save_cache(cache_file, model_input, LMAX, TIDE, FLAG, PACKED, DTYPE):
+    #-- write to a temporary file and replace atomically so that an
+    #-- interrupted write cannot leave a truncated sidecar file behind
+    temp_file = '{0}.tmp'.format(cache_file)
+    with open(temp_file, 'wb') as fileID:
+        #-- store the parameters used for the parse for validation on load
+        np.savez(fileID, _LMAX=LMAX, _TIDE=TIDE, _FLAG=FLAG,
+            _PACKED=PACKED, _DTYPE=np.dtype(DTYPE).str, **model_input)
+    os.replace(temp_file, cache_file)
+
+#-- PURPOSE: load a parsed gravity model from a numpy sidecar file
+#-- returns None if the sidecar does not match the requested parameters
+#-- or cannot be read, falling back to a reparse of the gravity model
+def _load_cache(cache_file, LMAX, TIDE, FLAG, PACKED, DTYPE):
+    try:
+        with np.load(cache_file) as fileID:
+            #-- validate the parameters used to create the sidecar file
+            if (str(fileID['_TIDE']) != TIDE) or (str(fileID['_FLAG']) != FLAG):
+                return None
+            if (bool(fileID['_PACKED']) != PACKED):
+                return None
+            if (str(fileID['_DTYPE']) != np.dtype(DTYPE).str):
+                return None
+            cached_LMAX = int(fileID['_LMAX'])
+            if LMAX and (int(LMAX) != cached_LMAX):
+                return None
+            if not LMAX and (cached_LMAX != int(str(fileID['max_degree']))):
+                return None
+            #-- rebuild the model dictionary from the stored variables
+            model_input = {}
+            for key in fileID.files:
+                if key.startswith('_'):
+                    continue
+                val = fileID[key]
+                model_input[key] = val.item() if (val.ndim == 0) else val
+            return model_input
+    except (KeyError, ValueError, OSError, zipfile.BadZipFile):
+        #-- corrupted, truncated or foreign sidecar file
+        return None